@@ -7,86 +7,134 @@
     # 1. Ensure this file is able to access the Moteus library, place in \moteus\moteus\lib\python
     # 2. Zero the proteus gripper at it's maximum opening
         #a. Zero in this script refers to setting the maximum opening position to 7.
-        #b. For true zero at 0.0, go to line 57 and change to 'd exact 0'. 
+        #b. For true zero at 0.0, change _ZERO_CMD to b'd exact 0'. 
     # 3. Keep below a torque limit of 0.1 when using the gripper with your hands
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 import asyncio
+import sys
+import time
 import moteus
-import threading
+
+# Use the libuv-based loop (winloop on Windows) when installed, else stock asyncio
+try:
+    if sys.platform == 'win32':
+        import winloop as uvloop
+    else:
+        import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+# Re-send interval for an unchanged setpoint, kept well inside the moteus watchdog timeout
+WATCHDOG_PERIOD = 0.05      # s (20hz)
+
+# Register keys as bare ints, so status reads skip the enum lookup
+_POS = int(moteus.Register.POSITION)
+_VEL = int(moteus.Register.VELOCITY)
+_TOR = int(moteus.Register.TORQUE)
+
+# Diagnostic command that sets the current position to the maximum opening
+_ZERO_CMD = b'd exact 7'
 
 class MotorController:
     def __init__(self):
-        self.controller = moteus.Controller(id=2)
+        # One explicit transport shared by the controller, the diagnostic stream and raw cycles
+        self.transport = moteus.get_singleton_transport()
+        self.controller = moteus.Controller(id=2, transport=self.transport)
         self.stream = moteus.Stream(self.controller)
+        self._query = self.controller.make_query()
         self.running = False
-        self.loop = asyncio.new_event_loop()
-        self.thread = threading.Thread(target=self.start_loop, daemon=True)
-        self.thread.start()
-        self.status = {"position": 0.0, "velocity": 0.0, "torque": 0.0}
-        self.polling = True
-        self.poll_thread = threading.Thread(target=self.poll_motor_status, daemon=True)
-        self.poll_thread.start()
-
-    def start_loop(self):
+        self._command = None  # Pre-built position command, rebuilt on each target change
+        self._target_changed = asyncio.Event()
+        # Shares the Tk thread; App.pump_loop steps it from the Tk mainloop
+        self.loop = _new_event_loop()
         asyncio.set_event_loop(self.loop)
-        self.loop.run_forever()
+        self.pos = self.vel = self.tor = 0.0  # Latest motor status
+        self.polling = True
+        self.loop.create_task(self._poll_motor_status())
+        self._cmd_task = self.loop.create_task(self._command_loop())
 
     async def _stop(self):
-        self.running = False
-        await self.controller.set_stop()
+        await self.controller.set_stop(query=False)
 
-    async def _run(self, target_position, target_kp_scale, target_kd_scale, target_velocity, target_torque):
-        self.running = False
-        await self.controller.set_stop()
-        await asyncio.sleep(0.02)
-        self.running = True
-        while self.running:
-            await self.controller.set_position(
-                position=target_position,
-                
-                kp_scale=target_kp_scale,
-                kd_scale=target_kd_scale,
-                velocity_limit=target_velocity,
-                maximum_torque=target_torque
-            )
-            await asyncio.sleep(1/300) #300hz
+    async def _command_loop(self):
+        # Persistent for the app's lifetime; run() and stop() just swap the target
+        cycle = self.transport.cycle
+        target_changed = self._target_changed
+        while True:
+            command = self._command
+            if command is None:
+                await target_changed.wait()  # Idle until run() sets a target
+            else:
+                # The command carries a query, so status arrives with each refresh
+                try:
+                    results = await cycle([command])
+                    if results:
+                        self._store_status(results[0].values)
+                except (moteus.CommandError, OSError, asyncio.TimeoutError):
+                    pass
+
+                # Only re-send when the target changes or the watchdog needs a refresh
+                try:
+                    await asyncio.wait_for(target_changed.wait(), timeout=WATCHDOG_PERIOD)
+                except asyncio.TimeoutError:
+                    pass
+            target_changed.clear()
 
     async def _zero(self):
-        await self.stream.command(f'd exact 7'.encode('utf8'))
+        await self.stream.command(_ZERO_CMD)
 
     def stop(self):
-        asyncio.run_coroutine_threadsafe(self._stop(), self.loop)
+        self.running = False
+        self._command = None
+        self._target_changed.set()
+        self.loop.create_task(self._stop())
 
     def run(self, target_position, target_kp_scale, target_kd_scale, target_velocity, target_torque):
-        asyncio.run_coroutine_threadsafe(
-            self._run(target_position, target_kp_scale, target_kd_scale, target_velocity, target_torque), 
-            self.loop
+        self._command = self.controller.make_position(
+            position=target_position,
+            kp_scale=target_kp_scale,
+            kd_scale=target_kd_scale,
+            velocity_limit=target_velocity,
+            maximum_torque=target_torque,
+            query=True
         )
+        self.running = True
+        self._target_changed.set()
     
-    def poll_motor_status(self):
+    def _store_status(self, v):
+        self.pos = v[_POS]
+        self.vel = v[_VEL]
+        self.tor = v[_TOR]
+
+    async def _poll_motor_status(self):
+        # Only queries while idle; during motion the command loop reads status from its replies
         while self.polling:
-            try:
-                state = asyncio.run_coroutine_threadsafe(self.controller.query(), self.loop).result()
-                self.status["position"] = state.values[moteus.Register.POSITION]
-                self.status["velocity"] = state.values[moteus.Register.VELOCITY]
-                self.status["torque"] = state.values[moteus.Register.TORQUE]
-            except:
-                pass
-            
-            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), self.loop)
+            if not self.running:
+                try:
+                    results = await self.transport.cycle([self._query])
+                    if results:
+                        self._store_status(results[0].values)
+                except (moteus.CommandError, OSError, asyncio.TimeoutError):
+                    pass
+
+            await asyncio.sleep(0.01)
 
     def zero(self):
-        asyncio.run_coroutine_threadsafe(self._zero(), self.loop)
+        self.loop.create_task(self._zero())
 
 
 class App:
     def __init__(self, root):
         self.root = root
         self.motor = MotorController()
+        self._last = (None, None, None)  # Last readings shown, to skip redundant redraws
+        self._next = time.monotonic()  # Deadline of the next live-readings refresh
         self.setup_ui()
         self.update_live_readings()
+        self.pump_loop()
         
     def setup_ui(self):
         self.root.title("Basic Motor/Gripper Control")
@@ -99,106 +147,53 @@ class App:
         self.set_velocity = tk.DoubleVar(value=1.0)
         self.set_torque = tk.DoubleVar(value=0.01)
 
-        # Initialize Live Readings
-        self.current_position = tk.StringVar(value="0.0")
-        self.current_velocity = tk.StringVar(value="0.0")
-        self.current_torque = tk.StringVar(value="0.0")
-        
-        # Position Control
-        ttk.Label(self.root, text="Set Position:").grid(column=1, row=1, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=-7.0, 
-            to=7.0, 
-            increment=0.5,
-            textvariable=self.set_position,
-            width=6
-        ).grid(column=2, row=1, sticky='w', padx=5, pady=5)
-
-        # Position (Current Reading)
-        ttk.Label(self.root, text="Current Position: ").grid(column=3, row=1, padx=5, pady=5)
-        ttk.Label(self.root, textvariable=self.current_position).grid(column=4, row=1, padx=5, pady=5)
-        
-        # KP Scale Control
-        ttk.Label(self.root, text="Set KP Scale (0 to 1):").grid(column=1, row=2, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=0, 
-            to=1, 
-            increment=0.05,
-            textvariable=self.set_kp_scale,
-            width=6
-        ).grid(column=2, row=2, sticky='w', padx=5, pady=5)
-        
-        # KD Scale Control
-        ttk.Label(self.root, text="Set KD Scale (0 to 1):").grid(column=1, row=3, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=0, 
-            to=1, 
-            increment=0.05,
-            textvariable=self.set_kd_scale,
-            width=6
-        ).grid(column=2, row=3, sticky='w', padx=5, pady=5)
-
-        # Max Velocity Control
-        ttk.Label(self.root, text="Set Max Velocity:").grid(column=1, row=4, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=0, 
-            to=50, 
-            increment=1.0,
-            textvariable=self.set_velocity,
-            width=6
-        ).grid(column=2, row=4, sticky='w', padx=5, pady=5)
-
-        # Velocity (Current Reading)
-        ttk.Label(self.root, text="Current Velocity: ").grid(column=3, row=4, padx=5, pady=5)
-        ttk.Label(self.root, textvariable=self.current_velocity).grid(column=4, row=4, padx=5, pady=5)
-
-        # Max Torque Control
-        ttk.Label(self.root, text="Set Max Torque (0 to 0.47):").grid(column=1, row=5, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=0, 
-            to=0.470, 
-            increment=0.005,
-            textvariable=self.set_torque,
-            width=6
-        ).grid(column=2, row=5, sticky='w', padx=5, pady=5)
-
-        # Torque (Current Readings)
-        ttk.Label(self.root, text="Current Torque: ").grid(column=3, row=5, padx=5, pady=5)
-        ttk.Label(self.root, textvariable=self.current_torque).grid(column=4, row=5, padx=5, pady=5)
-        
-        # Control buttons
-        ttk.Button(
-            self.root, 
-            text="Go", 
-            command=self.go,
-            style='Green.TButton'
-        ).grid(column=2, row=6, padx=5, pady=10)
-        
-        ttk.Button(
-            self.root, 
-            text="Stop", 
-            command=self.stop,
-            style='Orange.TButton'
-        ).grid(column=4, row=6, padx=5, pady=10)
+        # Setpoint controls: (label, from, to, increment, variable, row)
+        spinboxes = (
+            ("Set Position:", -7.0, 7.0, 0.5, self.set_position, 1),
+            ("Set KP Scale (0 to 1):", 0, 1, 0.05, self.set_kp_scale, 2),
+            ("Set KD Scale (0 to 1):", 0, 1, 0.05, self.set_kd_scale, 3),
+            ("Set Max Velocity:", 0, 50, 1.0, self.set_velocity, 4),
+            ("Set Max Torque (0 to 0.47):", 0, 0.470, 0.005, self.set_torque, 5),
+        )
+        for text, lo, hi, inc, var, row in spinboxes:
+            ttk.Label(self.root, text=text).grid(column=1, row=row, sticky='e', padx=5, pady=5)
+            ttk.Spinbox(
+                self.root, 
+                from_=lo, 
+                to=hi, 
+                increment=inc,
+                textvariable=var,
+                width=6
+            ).grid(column=2, row=row, sticky='w', padx=5, pady=5)
+
+        # Live readings: (label, row). Values are written straight to the labels, no StringVar
+        readings = (
+            ("Current Position: ", 1),
+            ("Current Velocity: ", 4),
+            ("Current Torque: ", 5),
+        )
+        value_labels = []
+        for text, row in readings:
+            ttk.Label(self.root, text=text).grid(column=3, row=row, padx=5, pady=5)
+            label = ttk.Label(self.root, text="0.0")
+            label.grid(column=4, row=row, padx=5, pady=5)
+            value_labels.append(label)
+        self.pos_label, self.vel_label, self.tor_label = value_labels
         
-        ttk.Button(
-            self.root, 
-            text="QUIT", 
-            command=self.quit_app,
-            style='Red.TButton'
-        ).grid(column=1, row=6, padx=5, pady=10)
-
-        ttk.Button(
-            self.root, 
-            text="Zero", 
-            command=self.zero,
-            style='Black.TButton'
-        ).grid(column=5, row=1, padx=5, pady=10)
+        # Control buttons: (label, command, style, column, row)
+        buttons = (
+            ("Go", self.go, 'Green.TButton', 2, 6),
+            ("Stop", self.stop, 'Orange.TButton', 4, 6),
+            ("QUIT", self.quit_app, 'Red.TButton', 1, 6),
+            ("Zero", self.zero, 'Black.TButton', 5, 1),
+        )
+        for text, command, style, column, row in buttons:
+            ttk.Button(
+                self.root, 
+                text=text, 
+                command=command,
+                style=style
+            ).grid(column=column, row=row, padx=5, pady=10)
         
         # Configure styles
         style = ttk.Style()
@@ -206,11 +201,27 @@ class App:
         style.configure('Orange.TButton', foreground='black', background='orange')
         style.configure('Red.TButton', foreground='black', background='red')
 
+    def pump_loop(self):
+        # Run one pass of the motor loop, then hand control back to Tk
+        self.motor.loop.call_soon(self.motor.loop.stop)
+        self.motor.loop.run_forever()
+        self.root.after(5, self.pump_loop)
+
     def update_live_readings(self):
-        self.current_position.set(f"{self.motor.status['position']:.3f}")
-        self.current_velocity.set(f"{self.motor.status['velocity']:.3f}")
-        self.current_torque.set(f"{self.motor.status['torque']:.3f}")
-        self.root.after(100, self.update_live_readings)
+        new = (round(self.motor.pos, 3), round(self.motor.vel, 3), round(self.motor.tor, 3))
+        if new != self._last:
+            self._last = new
+            self.pos_label.configure(text=f"{new[0]:.3f}")
+            self.vel_label.configure(text=f"{new[1]:.3f}")
+            self.tor_label.configure(text=f"{new[2]:.3f}")
+
+        # Refresh less often while the motor is standing still. Scheduling against a
+        # monotonic deadline keeps time spent in this callback from stretching the period.
+        now = time.monotonic()
+        self._next += 0.1 if new[1] else 0.15
+        if now > self._next + 0.5:
+            self._next = now  # Too far behind, drop the missed refreshes
+        self.root.after(max(0, int((self._next - now) * 1000)), self.update_live_readings)
 
     def go(self):
         try:
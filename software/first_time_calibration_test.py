@@ -17,6 +17,7 @@
 # For detailed documentation on the Moteus GUI, refer to the Moteus Reference by Josh Pieper
 
 import subprocess
+import sys
 import aioconsole
 import asyncio
 import moteus
@@ -30,9 +31,21 @@ MAX_VELOCITY_RESET = 2      # rad/s
 MAX_ACCELERATION_RESET = 2  # rad/s²
 MAX_TORQUE_RESET = 0.02     # Nm
 
+# Command re-send interval while the input is unchanged, inside the moteus watchdog timeout
+WATCHDOG_PERIOD = 0.05      # s
+
 #Set Controller ID
 controller_id=1
 
+# Controllers by ID, reused across menu actions instead of re-created each time
+_controller_cache = {}
+
+def get_controller(controller_id):
+    """Return the shared moteus controller for this ID, creating it on first use"""
+    if controller_id not in _controller_cache:
+        _controller_cache[controller_id] = moteus.Controller(controller_id)
+    return _controller_cache[controller_id]
+
 def display_menu():
     """Display calibration options and get user input"""
     while True:
@@ -132,7 +145,7 @@ def display_menu():
 
 def stop_and_reset_motor(controller_id):
     """Stop the motor and reset its state for calibration."""
-    c = moteus.Controller(controller_id)
+    c = get_controller(controller_id)
     c.set_stop()  # Stop and de-energize the motor
     print(f"Motor {controller_id} stopped and reset for calibration.")
 
@@ -140,22 +153,22 @@ def stop_and_reset_motor(controller_id):
 def run_encoder_calibration(controller_id):
     """Run the standard calibration script"""
     print("\nRunning standard calibration...")
-    encoder_calibration_command = f"python -m moteus.moteus_tool --target {controller_id} --calibrate"
-    subprocess.run(encoder_calibration_command, shell=True)
+    encoder_calibration_command = [sys.executable, "-m", "moteus.moteus_tool", "--target", str(controller_id), "--calibrate"]
+    subprocess.run(encoder_calibration_command)
 
 #2 - Encoder compensation
 def run_encoder_compensation():
     """Run the encoder compensation script"""
     print("\nRunning encoder compensation...")
-    encoder_compensation_command = f"python moteus/moteus/utils/compensate_encoder.py --plot"
-    subprocess.run(encoder_compensation_command, shell=True)
+    encoder_compensation_command = [sys.executable, "moteus/moteus/utils/compensate_encoder.py", "--plot"]
+    subprocess.run(encoder_compensation_command)
 
 #4 - Cogging compensation
 def run_cogging_compensation():
     """Run the cogging compensation script"""
     print("\nRunning cogging compensation...")
-    cogging_compensation_command = f"python moteus/moteus/utils/compensate_cogging.py --store --plot-results"
-    subprocess.run(cogging_compensation_command, shell=True)
+    cogging_compensation_command = [sys.executable, "moteus/moteus/utils/compensate_cogging.py", "--store", "--plot-results"]
+    subprocess.run(cogging_compensation_command)
 
 #5 - All in one calibration (done above)
 
@@ -164,8 +177,8 @@ def run_tview():
     """Opening Moteus GUI (tview)"""
     print("\nRunning Moteus GUI (tview)...")
     print("Close GUI window to return to main menu!")
-    tview_command = f"python -m moteus_gui.tview --devices={controller_id}"
-    subprocess.run(tview_command, shell=True)
+    tview_command = [sys.executable, "-m", "moteus_gui.tview", f"--devices={controller_id}"]
+    subprocess.run(tview_command)
 
 #7 - Set velocity limits (done above)
 #8 - Set acceleration limits (done above)
@@ -174,12 +187,13 @@ def run_tview():
 #10 - Fixed Position motor command
 async def fixed_position(controller_id):
     # Initialize the moteus controller
-    c = moteus.Controller(controller_id)
+    c = get_controller(controller_id)
     await c.set_stop()  # Ensure the motor is stopped initially
 
     target_position = 0.0  # Initial target position
     target_torque = MAX_TORQUE #Initial target torque
     running = True  # Flag to control the main loop
+    changed = asyncio.Event()  # Set when the user input changes the command
 
     async def read_user_input():
         """Coroutine to read user input asynchronously."""
@@ -193,11 +207,13 @@ async def fixed_position(controller_id):
                 if user_input.strip().lower() == 'e':
                     print("Exiting...")
                     running = False
+                    changed.set()
                     break
 
                 # Update the target position
                 target_torque = float(user_input)
                 print(f"New torque limit set: {target_torque:.3f} ")
+                changed.set()
             except ValueError:
                 print("Invalid input. Please enter a number or 'e' to exit.")
 
@@ -212,7 +228,13 @@ async def fixed_position(controller_id):
                 maximum_torque=target_torque,
                 query=False
             )
-            await asyncio.sleep(0.01)  # Small delay to prevent busy-waiting
+
+            # Re-send on new input, otherwise only at the watchdog refresh rate
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=WATCHDOG_PERIOD)
+            except asyncio.TimeoutError:
+                pass
+            changed.clear()
 
     # Run both coroutines concurrently
     await asyncio.gather(read_user_input(), run_motor())
@@ -224,11 +246,12 @@ async def fixed_position(controller_id):
 #11 - Fixed Position motor command
 async def fixed_velocity(controller_id):
     # Initialize the moteus controller
-    c = moteus.Controller(controller_id)
+    c = get_controller(controller_id)
     await c.set_stop()  # Ensure the motor is stopped initially
 
     target_velocity = 0.0 #Initial target velocity
     running = True  # Flag to control the main loop
+    changed = asyncio.Event()  # Set when the user input changes the command
 
     async def read_user_input():
         """Coroutine to read user input asynchronously."""
@@ -242,11 +265,13 @@ async def fixed_velocity(controller_id):
                 if user_input.strip().lower() == 'e':
                     print("Exiting...")
                     running = False
+                    changed.set()
                     break
 
                 # Update the target position
                 target_velocity = float(user_input)
                 print(f"New velocity set: {target_velocity:.3f} ")
+                changed.set()
             except ValueError:
                 print("Invalid input. Please enter a number or 'e' to exit.")
 
@@ -260,7 +285,13 @@ async def fixed_velocity(controller_id):
                 maximum_torque=MAX_TORQUE,
                 query=False
             )
-            await asyncio.sleep(0.01)  # Small delay to prevent busy-waiting
+
+            # Re-send on new input, otherwise only at the watchdog refresh rate
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=WATCHDOG_PERIOD)
+            except asyncio.TimeoutError:
+                pass
+            changed.clear()
 
     # Run both coroutines concurrently
     await asyncio.gather(read_user_input(), run_motor())
@@ -272,11 +303,12 @@ async def fixed_velocity(controller_id):
 #12 - Move-to motor command
 async def move_to_motor_position(controller_id):
     # Initialize the moteus controller
-    c = moteus.Controller(controller_id)
+    c = get_controller(controller_id)
     await c.set_stop()  # Ensure the motor is stopped initially
 
     target_position = 0.0  # Initial target position
     running = True  # Flag to control the main loop
+    changed = asyncio.Event()  # Set when the user input changes the command
 
     async def read_user_input():
         """Coroutine to read user input asynchronously."""
@@ -290,11 +322,13 @@ async def move_to_motor_position(controller_id):
                 if user_input.strip().lower() == 'e':
                     print("Exiting...")
                     running = False
+                    changed.set()
                     break
 
                 # Update the target position
                 target_position = float(user_input)
                 print(f"New target position set: {target_position:.3f} ")
+                changed.set()
             except ValueError:
                 print("Invalid input. Please enter a number or 'e' to exit.")
 
@@ -309,7 +343,13 @@ async def move_to_motor_position(controller_id):
                 maximum_torque=MAX_TORQUE,
                 query=False
             )
-            await asyncio.sleep(0.01)  # Small delay to prevent busy-waiting
+
+            # Re-send on new input, otherwise only at the watchdog refresh rate
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=WATCHDOG_PERIOD)
+            except asyncio.TimeoutError:
+                pass
+            changed.clear()
 
     # Run both coroutines concurrently
     await asyncio.gather(read_user_input(), run_motor())
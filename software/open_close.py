@@ -12,52 +12,78 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import asyncio
+import sys
 import moteus
-import threading
+
+# Use the libuv-based loop (winloop on Windows) when installed, else stock asyncio
+try:
+    if sys.platform == 'win32':
+        import winloop as uvloop
+    else:
+        import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+# Re-send interval for an unchanged setpoint, kept well inside the moteus watchdog timeout
+WATCHDOG_PERIOD = 0.05      # s (20hz)
 
 class MotorController:
     def __init__(self):
         self.controller = moteus.Controller(id=2)
         self.running = False
-        self.loop = asyncio.new_event_loop()
-        self.thread = threading.Thread(target=self.start_loop, daemon=True)
-        self.thread.start()
-
-    def start_loop(self):
+        self._command = None  # Pre-built position command, rebuilt on each target change
+        self._target_changed = asyncio.Event()
+        # Shares the Tk thread; App.pump_loop steps it from the Tk mainloop
+        self.loop = _new_event_loop()
         asyncio.set_event_loop(self.loop)
-        self.loop.run_forever()
+        self._cmd_task = self.loop.create_task(self._command_loop())
 
     async def _stop(self):
-        self.running = False
-        await self.controller.set_stop()
+        await self.controller.set_stop(query=False)
 
-    async def _run(self, velocity, max_torque):
-        self.running = False
-        await self.controller.set_stop()
-        await asyncio.sleep(0.02)
-        self.running = True
-        while self.running:
-            await self.controller.set_position(
-                position=float('nan'),
-                velocity=velocity,
-                maximum_torque=max_torque
-            )
-            await asyncio.sleep(1/300) #300hz
+    async def _command_loop(self):
+        # Persistent for the app's lifetime; run() and stop() just swap the target
+        execute = self.controller.execute
+        target_changed = self._target_changed
+        while True:
+            command = self._command
+            if command is None:
+                await target_changed.wait()  # Idle until run() sets a target
+            else:
+                try:
+                    await execute(command)
+                except (moteus.CommandError, OSError, asyncio.TimeoutError):
+                    pass
+
+                # Only re-send when the target changes or the watchdog needs a refresh
+                try:
+                    await asyncio.wait_for(target_changed.wait(), timeout=WATCHDOG_PERIOD)
+                except asyncio.TimeoutError:
+                    pass
+            target_changed.clear()
 
     def stop(self):
-        asyncio.run_coroutine_threadsafe(self._stop(), self.loop)
+        self.running = False
+        self._command = None
+        self._target_changed.set()
+        self.loop.create_task(self._stop())
 
     def run(self, velocity, max_torque):
-        asyncio.run_coroutine_threadsafe(
-            self._run(velocity, max_torque), 
-            self.loop
+        self._command = self.controller.make_position(
+            position=float('nan'),
+            velocity=velocity,
+            maximum_torque=max_torque
         )
+        self.running = True
+        self._target_changed.set()
 
 class App:
     def __init__(self, root):
         self.root = root
         self.motor = MotorController()
         self.setup_ui()
+        self.pump_loop()
         
     def setup_ui(self):
         self.root.title("Standalone Gripper Interface")
@@ -68,67 +94,37 @@ class App:
         self.max_speed = tk.DoubleVar(value=1.0)
         self.max_accel = tk.DoubleVar(value=5.0)
         
-        # Torque control
-        ttk.Label(self.root, text="Max Torque (0-0.47):").grid(column=1, row=1, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=0.01, 
-            to=0.47, 
-            increment=0.01,
-            textvariable=self.max_torque,
-            width=6
-        ).grid(column=2, row=1, sticky='w', padx=5, pady=5)
-        
-        # Speed control
-        ttk.Label(self.root, text="Max Speed (0-20):").grid(column=1, row=2, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=0, 
-            to=20, 
-            increment=0.1,
-            textvariable=self.max_speed,
-            width=6
-        ).grid(column=2, row=2, sticky='w', padx=5, pady=5)
-        
-        # Acceleration control
-        ttk.Label(self.root, text="Max Acceleration (0-20):").grid(column=1, row=3, sticky='e', padx=5, pady=5)
-        ttk.Spinbox(
-            self.root, 
-            from_=0, 
-            to=20, 
-            increment=0.1,
-            textvariable=self.max_accel,
-            width=6
-        ).grid(column=2, row=3, sticky='w', padx=5, pady=5)
-        
-        # Control buttons
-        ttk.Button(
-            self.root, 
-            text="Open", 
-            command=self.open,
-            style='Green.TButton'
-        ).grid(column=2, row=4, padx=5, pady=10)
-        
-        ttk.Button(
-            self.root, 
-            text="Close", 
-            command=self.close,
-            style='Yellow.TButton'
-        ).grid(column=3, row=4, padx=5, pady=10)
-        
-        ttk.Button(
-            self.root, 
-            text="Stop", 
-            command=self.stop,
-            style='Orange.TButton'
-        ).grid(column=4, row=4, padx=5, pady=10)
+        # Limit controls: (label, from, to, increment, variable, row)
+        spinboxes = (
+            ("Max Torque (0-0.47):", 0.01, 0.47, 0.01, self.max_torque, 1),
+            ("Max Speed (0-20):", 0, 20, 0.1, self.max_speed, 2),
+            ("Max Acceleration (0-20):", 0, 20, 0.1, self.max_accel, 3),
+        )
+        for text, lo, hi, inc, var, row in spinboxes:
+            ttk.Label(self.root, text=text).grid(column=1, row=row, sticky='e', padx=5, pady=5)
+            ttk.Spinbox(
+                self.root, 
+                from_=lo, 
+                to=hi, 
+                increment=inc,
+                textvariable=var,
+                width=6
+            ).grid(column=2, row=row, sticky='w', padx=5, pady=5)
         
-        ttk.Button(
-            self.root, 
-            text="QUIT", 
-            command=self.quit_app,
-            style='Red.TButton'
-        ).grid(column=1, row=4, padx=5, pady=10)
+        # Control buttons: (label, command, style, column)
+        buttons = (
+            ("Open", self.open, 'Green.TButton', 2),
+            ("Close", self.close, 'Yellow.TButton', 3),
+            ("Stop", self.stop, 'Orange.TButton', 4),
+            ("QUIT", self.quit_app, 'Red.TButton', 1),
+        )
+        for text, command, style, column in buttons:
+            ttk.Button(
+                self.root, 
+                text=text, 
+                command=command,
+                style=style
+            ).grid(column=column, row=4, padx=5, pady=10)
         
         # Configure styles
         style = ttk.Style()
@@ -137,6 +133,12 @@ class App:
         style.configure('Orange.TButton', foreground='black', background='orange')
         style.configure('Red.TButton', foreground='black', background='red')
         
+    def pump_loop(self):
+        # Run one pass of the motor loop, then hand control back to Tk
+        self.motor.loop.call_soon(self.motor.loop.stop)
+        self.motor.loop.run_forever()
+        self.root.after(5, self.pump_loop)
+
     def open(self):
         try:
             self.motor.run(
@@ -9,11 +9,37 @@
         #b. Ensure after gripper homing, position reads 7
         #c. Re-home if above values don't match within +-0.05 rotations
 
+import array
 import asyncio
+import ctypes
+import math
+import os
+import sys
 import moteus
 import tkinter as tk
-from tkinter import ttk, messagebox
-from threading import Thread
+from tkinter import ttk
+
+# Use the libuv-based loop (winloop on Windows) when installed, else stock asyncio
+try:
+    if sys.platform == 'win32':
+        import winloop as uvloop
+    else:
+        import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+def _set_realtime_priority():
+    """Raise the calling thread to real-time priority; needs CAP_SYS_NICE on Linux or admin on Windows"""
+    try:
+        if sys.platform == 'win32':
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 15):  # THREAD_PRIORITY_TIME_CRITICAL
+                raise ctypes.WinError()
+        elif hasattr(os, 'sched_setscheduler'):
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(80))
+    except OSError as e:
+        print(f"Real-time priority unavailable, running at normal priority: {e}")
 
 class MotorControlApp:
     def __init__(self, root):
@@ -21,8 +47,6 @@ class MotorControlApp:
         self.root.title("Motor Control")
         
         # Motor control flags
-        self.controller = moteus.Controller(id=2)
-        self.stream = moteus.Stream(self.controller)
         self.running = False
         self.monitoring = True  # Flag for continuous monitoring
         self.homing_trigger = False
@@ -31,6 +55,11 @@ class MotorControlApp:
         self.control_task = None  # For motor control
         self.monitor_task = None  # For continuous monitoring
         self.controllers = {}  # To store motor controllers
+        self.transport = None  # Shared moteus transport, created on the motor loop
+        # Newest monitor sample (trigger pos, gripper pos, trigger torque, gripper torque),
+        # written in place by monitor_motors and rendered by _gui_tick
+        self._samples = array.array('d', [0.0, 0.0, 0.0, 0.0])
+        self._last_texts = ["", "", "", ""]  # Text currently shown in each readout label
         
         # Create GUI elements
         self.create_widgets()
@@ -72,29 +101,55 @@ class MotorControlApp:
         self.hometrig_btn = ttk.Button(
             self.root, 
             text="Home Trigger",
-            command=lambda: asyncio.run_coroutine_threadsafe(self.home_trigger(), self.loop)
+            command=lambda: self.loop.create_task(self.home_trigger())
         )
         self.hometrig_btn.grid(row=0, column=5, padx=5, pady=5)
 
         self.homegrip_btn = ttk.Button(
             self.root, 
             text="Home Gripper",
-            command=lambda: asyncio.run_coroutine_threadsafe(self.home_gripper(), self.loop)
+            command=lambda: self.loop.create_task(self.home_gripper())
         )
         self.homegrip_btn.grid(row=1, column=5, padx=5, pady=5)
+
+        # Status line, used instead of modal dialogs so the event loop never blocks
+        self.status_var = tk.StringVar(value="Ready")
+        self._status_clear = None
+        ttk.Label(self.root, textvariable=self.status_var).grid(row=6, column=0, columnspan=4, sticky='w', padx=5, pady=5)
+
+        self._gui_tick()
         
     def update_positions(self, trigger_pos, gripper_pos, trigger_torque, gripper_torque):
-        self.trigger_pos.config(text=f"{trigger_pos:.2f} rot")
-        self.gripper_pos.config(text=f"{gripper_pos:.2f} rot")
-        self.trigger_torque.config(text=f"{trigger_torque:.2f} Nm")
-        self.gripper_torque.config(text=f"{gripper_torque:.2f} Nm")
-        self.root.update()
+        texts = (
+            f"{trigger_pos:.2f} rot",
+            f"{gripper_pos:.2f} rot",
+            f"{trigger_torque:.2f} Nm",
+            f"{gripper_torque:.2f} Nm"
+        )
+        labels = (self.trigger_pos, self.gripper_pos, self.trigger_torque, self.gripper_torque)
+        # Only reconfigure labels whose rounded text actually changed
+        for i, (label, text) in enumerate(zip(labels, texts)):
+            if text != self._last_texts[i]:
+                label.config(text=text)
+                self._last_texts[i] = text
+
+    def set_status(self, message):
+        """Show a status message, reverting to Ready after a few seconds"""
+        self.status_var.set(message)
+        if self._status_clear is not None:
+            self.root.after_cancel(self._status_clear)
+        self._status_clear = self.root.after(3000, self.status_var.set, "Ready")
+
+    def _gui_tick(self):
+        """Render the newest monitor sample at ~30hz, however fast samples arrive"""
+        self.update_positions(*self._samples)
+        self.root.after(33, self._gui_tick)
         
     def start_monitoring(self):
-        """Start the monitoring thread when app launches"""
-        self.loop = asyncio.new_event_loop()
-        self.monitor_task = Thread(target=self.run_monitoring, daemon=True)
-        self.monitor_task.start()
+        """Create the app's event loop and schedule monitoring on it when app launches"""
+        self.loop = _new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.monitor_task = asyncio.ensure_future(self.monitor_motors(), loop=self.loop)
         
     def start_control(self):
         if not self.running:
@@ -103,7 +158,7 @@ class MotorControlApp:
             self.stop_btn.config(state=tk.NORMAL)
             
             # Start control in the existing event loop
-            asyncio.run_coroutine_threadsafe(self.motor_control(), self.loop)
+            self.control_task = self.loop.create_task(self.motor_control())
             
     def stop_control(self):
         self.running = False
@@ -120,32 +175,51 @@ class MotorControlApp:
         
     async def initialize_controllers(self):
         """Initialize motor controllers if they don't exist"""
+        if self.transport is None:
+            self.transport = moteus.get_singleton_transport()
         if 1 not in self.controllers:
-            self.controllers[1] = moteus.Controller(id=1)
+            self.controllers[1] = moteus.Controller(id=1, transport=self.transport)
             await self.controllers[1].set_stop()
         if 2 not in self.controllers:
-            self.controllers[2] = moteus.Controller(id=2)
+            self.controllers[2] = moteus.Controller(id=2, transport=self.transport)
             await self.controllers[2].set_stop()
         return self.controllers[1], self.controllers[2]
         
     async def motor_control(self):
         c1, c2 = await self.initialize_controllers()
-        
+
+        # Pace against loop-time deadlines so oversleeping does not accumulate as drift
+        period = 1/1000 # 1khz
+        next_t = self.loop.time() + period
+        POSITION = moteus.Register.POSITION
+        trigger_cmd = c1.make_position(
+            position=math.nan,
+            maximum_torque=0.015,
+            query=True
+        )
+        cmd = math.nan  # No trigger sample yet, so the gripper holds for the first tick
         try:
             while self.running:
-                state1 = await c1.set_position(
-                    position=float('nan'),
-                    maximum_torque=0.015,
-                    query=True
-                )
-                position = state1.values[moteus.Register.POSITION]
-                
-                await c2.set_position(
-                    position=7-position,
-                    maximum_torque=0.1,
-                    query=True
-                )
-                await asyncio.sleep(1/1000)
+                # Trigger and gripper share one bus transaction, so the gripper
+                # follows the trigger sample from the previous tick
+                results = await self.transport.cycle([
+                    trigger_cmd,
+                    c2.make_position(
+                        position=cmd,
+                        maximum_torque=0.1,
+                        query=False  # Gripper state comes from monitor_motors
+                    )
+                ])
+                state1 = results[0]
+                position = state1.values[POSITION]
+                cmd = 7.0 - position
+
+                now = self.loop.time()
+                if next_t > now:
+                    await asyncio.sleep(next_t - now)
+                    next_t += period
+                else:
+                    next_t = now + period  # Running behind, re-anchor instead of bursting
                 
         finally:
             await c1.set_stop()
@@ -153,25 +227,29 @@ class MotorControlApp:
             
     async def monitor_motors(self):
         """Continuous monitoring of motor positions and torques"""
+        POSITION = moteus.Register.POSITION
+        TORQUE = moteus.Register.TORQUE
         while self.monitoring:
             try:
+                # Set up once, then stay in the inner loop until a bus error forces a retry
                 c1, c2 = await self.initialize_controllers()
-                
-                # Query motor states without sending commands
-                state1 = await c1.query()
-                state2 = await c2.query()
-                
-                if state1 and state2:
-                    trigger_pos = state1.values[moteus.Register.POSITION]
-                    gripper_pos = state2.values[moteus.Register.POSITION]
-                    trigger_torque = state1.values[moteus.Register.TORQUE]
-                    gripper_torque = state2.values[moteus.Register.TORQUE]
+                queries = [c1.make_query(), c2.make_query()]
+
+                while self.monitoring:
+                    # Query both motor states in a single transport cycle
+                    results = await self.transport.cycle(queries)
+                    states = {result.id: result for result in results}
+                    state1 = states.get(1)
+                    state2 = states.get(2)
                     
-                    self.root.after(0, self.update_positions, 
-                                  trigger_pos, gripper_pos,
-                                  trigger_torque, gripper_torque)
-                
-                await asyncio.sleep(1/1000)
+                    if state1 and state2:
+                        samples = self._samples
+                        samples[0] = state1.values[POSITION]
+                        samples[1] = state2.values[POSITION]
+                        samples[2] = state1.values[TORQUE]
+                        samples[3] = state2.values[TORQUE]
+                    
+                    await asyncio.sleep(1/1000)
                 
             except Exception as e:
                 print(f"Monitoring error: {e}")
@@ -192,31 +270,40 @@ class MotorControlApp:
             await c1.set_stop()
             await asyncio.sleep(0.1)  # Brief pause
             
+            # Loop constants, bound once rather than looked up every sample
+            NAN = math.nan
+            TORQUE = moteus.Register.TORQUE
+            STALL_TORQUE = -0.02
+
             # Start moving slowly in negative direction
             homing__trigger_success = False
+            hit_count = 0  # Consecutive samples past the stall threshold
             while self.homing_trigger:
                 state = await c1.set_position(
-                    position=float('nan'),  # Velocity control mode
+                    position=NAN,  # Velocity control mode
                     velocity=-0.5,         # Move slowly in negative direction
                     maximum_torque=0.03,    # Set a reasonable torque limit
                     query=True
                 )
                 
-                # Check if we've hit the torque limit (negative torque means hitting the stop)
-                if state and state.values[moteus.Register.TORQUE] < -0.02:
-                    # Zero the position
-                    await self.stream.command(b'd exact 0')
+                # Check if we've hit the torque limit (negative torque means hitting the stop).
+                # Two samples in a row are required so a single noise spike can't end homing.
+                if state and state.values[TORQUE] < STALL_TORQUE:
+                    hit_count += 1
+                else:
+                    hit_count = 0
+                if hit_count >= 2:
+                    # Zero the position with a single register write
+                    await c1.set_output_exact(position=0.0)
                     await asyncio.sleep(0.1)  # Wait for command to take effect
                     homing__trigger_success = True
                     break
-                    
-                await asyncio.sleep(0.01)
                 
             if homing__trigger_success:
-                self.root.after(0, messagebox.showinfo, "Success", "Trigger homing completed")
+                self.set_status("Trigger homing completed")
                 
         except Exception as e:
-            self.root.after(0, messagebox.showerror, "Error", f"Homing failed: {str(e)}")
+            self.set_status(f"Trigger homing failed: {str(e)}")
         finally:
             self.homing_trigger = False
             self.root.after(0, lambda: self.hometrig_btn.config(state=tk.NORMAL))
@@ -237,46 +324,73 @@ class MotorControlApp:
             await c2.set_stop()
             await asyncio.sleep(0.1)  # Brief pause
             
+            # Loop constants, bound once rather than looked up every sample
+            NAN = math.nan
+            TORQUE = moteus.Register.TORQUE
+            STALL_TORQUE = 0.03
+
             # Start moving slowly in negative direction
             homing__gripper_success = False
+            hit_count = 0  # Consecutive samples past the stall threshold
             while self.homing_gripper:
                 state = await c2.set_position(
-                    position=float('nan'),  # Velocity control mode
+                    position=NAN,  # Velocity control mode
                     velocity=0.5,         # Move slowly in negative direction
                     maximum_torque=0.05,    # Set a reasonable torque limit
                     query=True
                 )
                 
-                # Check if we've hit the torque limit (negative torque means hitting the stop)
-                if state and state.values[moteus.Register.TORQUE] > 0.03:
-                    # Zero the position
-                    await self.stream.command(b'd exact 7')
+                # Check if we've hit the torque limit (negative torque means hitting the stop).
+                # Two samples in a row are required so a single noise spike can't end homing.
+                if state and state.values[TORQUE] > STALL_TORQUE:
+                    hit_count += 1
+                else:
+                    hit_count = 0
+                if hit_count >= 2:
+                    # Zero the position with a single register write
+                    await c2.set_output_exact(position=7.0)
                     await asyncio.sleep(0.1)  # Wait for command to take effect
                     homing__gripper_success = True
                     break
-                    
-                await asyncio.sleep(0.01)
                 
             if homing__gripper_success:
-                self.root.after(0, messagebox.showinfo, "Success", "Gripper homing completed")
+                self.set_status("Gripper homing completed")
                 
         except Exception as e:
-            self.root.after(0, messagebox.showerror, "Error", f"Homing failed: {str(e)}")
+            self.set_status(f"Gripper homing failed: {str(e)}")
         finally:
             self.homing_gripper = False
             self.root.after(0, lambda: self.homegrip_btn.config(state=tk.NORMAL))
             await c2.set_stop()
             
+    async def tk_pump(self):
+        """Drive Tk from the event loop in place of root.mainloop()"""
+        try:
+            while True:
+                self.root.update()
+                await asyncio.sleep(1/60)
+        except tk.TclError:
+            pass  # Window has been destroyed
+        finally:
+            self.monitoring = False
+
     def run_monitoring(self):
-        """Run the monitoring loop"""
-        asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self.monitor_motors())
+        """Run monitoring and the Tk pump on one loop until the window closes"""
+        _set_realtime_priority()  # Keep the scheduler from preempting the 1khz loop
+        self.loop.run_until_complete(asyncio.gather(self.monitor_task, self.tk_pump()))
 
 def main():
     root = tk.Tk()
     app = MotorControlApp(root)
     root.protocol("WM_DELETE_WINDOW", app.quit_app)
-    root.mainloop()
+    if sys.platform == 'win32':
+        # Default Windows timer resolution is ~15 ms, far coarser than the 1 ms control period
+        ctypes.windll.winmm.timeBeginPeriod(1)
+    try:
+        app.run_monitoring()
+    finally:
+        if sys.platform == 'win32':
+            ctypes.windll.winmm.timeEndPeriod(1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file